@@ -3,10 +3,9 @@ Create icon.ico for NexusDown application
 Run this once to generate the icon file
 """
 
-from PyQt5.QtGui import QPixmap, QPainter, QColor
+from PyQt5.QtGui import QPixmap, QPainter, QColor, QImage
 from PyQt5.QtCore import Qt
 from PIL import Image
-import io
 
 def create_icon():
     """Create application icon and save as .ico file"""
@@ -14,60 +13,59 @@ def create_icon():
     # Create multiple sizes for better quality
     sizes = [256, 128, 64, 48, 32, 16]
     images = []
-    
+
+    # Render the artwork once at the largest size; smaller sizes are
+    # derived by smooth downscaling instead of re-running the painter
+    size = 256
+    base_pixmap = QPixmap(size, size)
+    base_pixmap.fill(Qt.transparent)
+
+    painter = QPainter(base_pixmap)
+    painter.setRenderHint(QPainter.Antialiasing)
+
+    # Draw background circle
+    painter.setBrush(QColor(74, 144, 226))  # Blue
+    painter.setPen(Qt.NoPen)
+    margin = size // 16
+    painter.drawEllipse(margin, margin, size - 2*margin, size - 2*margin)
+
+    # Draw inner circle
+    painter.setBrush(QColor(255, 255, 255))  # White
+    inner_margin = size // 4
+    painter.drawEllipse(inner_margin, inner_margin,
+                      size - 2*inner_margin, size - 2*inner_margin)
+
+    # Draw download arrow
+    painter.setBrush(QColor(74, 144, 226))
+    arrow_width = size // 8
+    arrow_height = size // 3
+    arrow_x = (size - arrow_width) // 2
+    arrow_y = (size - arrow_height) // 2
+
+    # Arrow shaft
+    painter.drawRect(arrow_x, arrow_y, arrow_width, arrow_height * 2 // 3)
+
+    # Arrow head (triangle)
+    from PyQt5.QtGui import QPolygon
+    from PyQt5.QtCore import QPoint
+    points = QPolygon([
+        QPoint(arrow_x - arrow_width, arrow_y + arrow_height * 2 // 3),
+        QPoint(arrow_x + arrow_width * 2, arrow_y + arrow_height * 2 // 3),
+        QPoint(arrow_x + arrow_width // 2, arrow_y + arrow_height)
+    ])
+    painter.drawPolygon(points)
+
+    painter.end()
+
     for size in sizes:
-        # Create pixmap
-        pixmap = QPixmap(size, size)
-        pixmap.fill(Qt.transparent)
-        
-        painter = QPainter(pixmap)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Draw background circle
-        painter.setBrush(QColor(74, 144, 226))  # Blue
-        painter.setPen(Qt.NoPen)
-        margin = size // 16
-        painter.drawEllipse(margin, margin, size - 2*margin, size - 2*margin)
-        
-        # Draw inner circle
-        painter.setBrush(QColor(255, 255, 255))  # White
-        inner_margin = size // 4
-        painter.drawEllipse(inner_margin, inner_margin, 
-                          size - 2*inner_margin, size - 2*inner_margin)
-        
-        # Draw download arrow
-        painter.setBrush(QColor(74, 144, 226))
-        arrow_width = size // 8
-        arrow_height = size // 3
-        arrow_x = (size - arrow_width) // 2
-        arrow_y = (size - arrow_height) // 2
-        
-        # Arrow shaft
-        painter.drawRect(arrow_x, arrow_y, arrow_width, arrow_height * 2 // 3)
-        
-        # Arrow head (triangle)
-        from PyQt5.QtGui import QPolygon
-        from PyQt5.QtCore import QPoint
-        points = QPolygon([
-            QPoint(arrow_x - arrow_width, arrow_y + arrow_height * 2 // 3),
-            QPoint(arrow_x + arrow_width * 2, arrow_y + arrow_height * 2 // 3),
-            QPoint(arrow_x + arrow_width // 2, arrow_y + arrow_height)
-        ])
-        painter.drawPolygon(points)
-        
-        painter.end()
-        
-        # Convert QPixmap to PIL Image
-        # Save to temporary file instead of buffer (compatibility fix)
-        temp_png = f'temp_icon_{size}.png'
-        pixmap.save(temp_png, "PNG")
-        pil_image = Image.open(temp_png)
-        images.append(pil_image.copy())
-        pil_image.close()
-        
-        # Clean up temp file
-        import os
-        os.remove(temp_png)
+        # Scale the base render down to this size
+        pixmap = base_pixmap.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # Convert QPixmap to PIL Image directly from the raw RGBA buffer,
+        # skipping the PNG encode/decode and temp-file round-trip
+        qimage = pixmap.toImage().convertToFormat(QImage.Format_RGBA8888)
+        raw = bytes(qimage.constBits().asstring(qimage.sizeInBytes()))
+        images.append(Image.frombuffer('RGBA', (size, size), raw, 'raw', 'RGBA', 0, 1))
     
     # Save as .ico with multiple sizes
     images[0].save('icon.ico', format='ICO', sizes=[(img.width, img.height) for img in images])
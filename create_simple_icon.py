@@ -3,26 +3,32 @@ Create a simple icon.ico without Pillow dependency
 Uses only PyQt5 to create a basic ICO file
 """
 
-from PyQt5.QtGui import QPixmap, QPainter, QColor, QPolygon, QImage
-from PyQt5.QtCore import Qt, QPoint
+from PyQt5.QtGui import QPainter, QColor, QPolygon, QImage
+from PyQt5.QtCore import Qt, QPoint, QBuffer, QIODevice
 from PyQt5.QtWidgets import QApplication
 import sys
 import struct
 
+# Pre-compiled header formats, parsed once at import instead of per pack call
+_ICO_HDR = struct.Struct('<HHH')    # Reserved, Type, Count
+_DIR_ENTRY = struct.Struct('<BBBBHHII')
+
+
 def create_simple_icon():
     """Create a simple icon.ico file using only PyQt5"""
     
-    # Create application (required for QPixmap)
+    # Create application (required for QPainter font/style machinery)
     app = QApplication.instance()
     if app is None:
         app = QApplication(sys.argv)
-    
-    # Create a 256x256 icon
+
+    # Paint a 256x256 icon directly into a QImage; ARGB32_Premultiplied is
+    # QPainter's fast path and skips the QPixmap -> QImage copy per size
     size = 256
-    pixmap = QPixmap(size, size)
-    pixmap.fill(Qt.transparent)
-    
-    painter = QPainter(pixmap)
+    image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+
+    painter = QPainter(image)
     painter.setRenderHint(QPainter.Antialiasing)
     
     # Draw background circle (blue)
@@ -56,117 +62,54 @@ def create_simple_icon():
     painter.drawPolygon(points)
     
     painter.end()
-    
-    # Convert to QImage
-    image = pixmap.toImage()
-    
+
     # Save directly as PNG first (for testing)
-    pixmap.save('icon_temp.png', 'PNG')
+    image.save('icon_temp.png', 'PNG')
     
     # Create ICO file manually with multiple sizes
     sizes_to_create = [256, 128, 64, 48, 32, 16]
     
+    def build_entry(icon_size):
+        """Encode one size as a PNG payload (valid inside ICO since Vista)."""
+        scaled_image = image.scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+        # Let Qt's C PNG encoder produce the payload instead of assembling
+        # BMP headers, BGRA pixels and AND masks in Python
+        buffer = QBuffer()
+        buffer.open(QIODevice.WriteOnly)
+        scaled_image.save(buffer, 'PNG')
+        buffer.close()
+
+        return scaled_image.width(), scaled_image.height(), bytes(buffer.data())
+    
+    # Phase 1: render and encode each size exactly once
+    payloads = [build_entry(icon_size) for icon_size in sizes_to_create]
+    
     with open('icon.ico', 'wb') as ico_file:
         # ICO header
-        ico_file.write(struct.pack('<HHH', 0, 1, len(sizes_to_create)))  # Reserved, Type, Count
+        ico_file.write(_ICO_HDR.pack(0, 1, len(sizes_to_create)))  # Reserved, Type, Count
         
         offset = 6 + (16 * len(sizes_to_create))  # Header + directory entries
         
-        # Directory entries
-        for icon_size in sizes_to_create:
-            # Create scaled pixmap
-            scaled_pixmap = pixmap.scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            scaled_image = scaled_pixmap.toImage()
-            
-            # Convert to 32-bit RGBA
-            scaled_image = scaled_image.convertToFormat(QImage.Format_RGBA8888)
-            
-            # Calculate size
-            width = scaled_image.width()
-            height = scaled_image.height()
-            
-            # Create BMP data
-            bmp_data = bytearray()
-            
-            # BMP Info Header (40 bytes)
-            bmp_data.extend(struct.pack('<I', 40))  # Header size
-            bmp_data.extend(struct.pack('<i', width))  # Width
-            bmp_data.extend(struct.pack('<i', height * 2))  # Height (doubled for ICO)
-            bmp_data.extend(struct.pack('<H', 1))  # Planes
-            bmp_data.extend(struct.pack('<H', 32))  # Bits per pixel
-            bmp_data.extend(struct.pack('<I', 0))  # Compression
-            bmp_data.extend(struct.pack('<I', width * height * 4))  # Image size
-            bmp_data.extend(struct.pack('<i', 0))  # X pixels per meter
-            bmp_data.extend(struct.pack('<i', 0))  # Y pixels per meter
-            bmp_data.extend(struct.pack('<I', 0))  # Colors used
-            bmp_data.extend(struct.pack('<I', 0))  # Important colors
-            
-            # Pixel data (bottom-up, BGRA format)
-            for y in range(height - 1, -1, -1):
-                for x in range(width):
-                    pixel = scaled_image.pixel(x, y)
-                    b = (pixel >> 16) & 0xFF
-                    g = (pixel >> 8) & 0xFF
-                    r = pixel & 0xFF
-                    a = (pixel >> 24) & 0xFF
-                    bmp_data.extend([b, g, r, a])
-            
-            # AND mask (all zeros for 32-bit images with alpha)
-            and_mask = bytes(((width + 31) // 32 * 4) * height)
-            bmp_data.extend(and_mask)
-            
-            size_bytes = len(bmp_data)
-            
-            # Write directory entry
+        # Phase 2: directory entries from the cached payload lengths
+        for width, height, png_data in payloads:
             w = width if width < 256 else 0
             h = height if height < 256 else 0
-            ico_file.write(struct.pack('<BBBBHHII', 
+            ico_file.write(_DIR_ENTRY.pack(
                 w, h,  # Width, Height
                 0,  # Color palette
                 0,  # Reserved
                 1,  # Color planes
                 32,  # Bits per pixel
-                size_bytes,  # Size of image data
+                len(png_data),  # Size of image data
                 offset  # Offset to image data
             ))
             
-            offset += size_bytes
+            offset += len(png_data)
         
-        # Write image data for each size
-        for icon_size in sizes_to_create:
-            scaled_pixmap = pixmap.scaled(icon_size, icon_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            scaled_image = scaled_pixmap.toImage()
-            scaled_image = scaled_image.convertToFormat(QImage.Format_RGBA8888)
-            
-            width = scaled_image.width()
-            height = scaled_image.height()
-            
-            # BMP Info Header
-            ico_file.write(struct.pack('<I', 40))
-            ico_file.write(struct.pack('<i', width))
-            ico_file.write(struct.pack('<i', height * 2))
-            ico_file.write(struct.pack('<H', 1))
-            ico_file.write(struct.pack('<H', 32))
-            ico_file.write(struct.pack('<I', 0))
-            ico_file.write(struct.pack('<I', width * height * 4))
-            ico_file.write(struct.pack('<i', 0))
-            ico_file.write(struct.pack('<i', 0))
-            ico_file.write(struct.pack('<I', 0))
-            ico_file.write(struct.pack('<I', 0))
-            
-            # Pixel data
-            for y in range(height - 1, -1, -1):
-                for x in range(width):
-                    pixel = scaled_image.pixel(x, y)
-                    b = (pixel >> 16) & 0xFF
-                    g = (pixel >> 8) & 0xFF
-                    r = pixel & 0xFF
-                    a = (pixel >> 24) & 0xFF
-                    ico_file.write(bytes([b, g, r, a]))
-            
-            # AND mask
-            and_mask = bytes(((width + 31) // 32 * 4) * height)
-            ico_file.write(and_mask)
+        # Image data for each size
+        for _, _, png_data in payloads:
+            ico_file.write(png_data)
     
     print("✓ Icon created successfully: icon.ico")
     print("✓ Preview saved: icon_temp.png")
@@ -11,9 +11,11 @@ import sys
 import os
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
-from ui_mainwindow import MainWindow
-from database import DatabaseManager
+from PyQt5.QtGui import QIcon, QImage, QPixmap, QPixmapCache, QPainter, QColor
+
+# Rendered once on first use; both the app and the window (and any
+# future caller) share the same QIcon instead of re-running the painter
+_ICON_CACHE = None
 
 def create_simple_icon():
     """
@@ -22,11 +24,16 @@ def create_simple_icon():
     Returns:
         QIcon object
     """
-    # Create a simple 64x64 pixmap with a colored circle
-    pixmap = QPixmap(64, 64)
-    pixmap.fill(Qt.transparent)
+    global _ICON_CACHE
+    if _ICON_CACHE is not None:
+        return _ICON_CACHE
+
+    # Compose on a QImage: pure CPU raster, no round-trip through the
+    # platform backing store; premultiplied ARGB is QPainter's fast path
+    image = QImage(64, 64, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
     
-    painter = QPainter(pixmap)
+    painter = QPainter(image)
     painter.setRenderHint(QPainter.Antialiasing)
     
     # Draw background circle
@@ -40,7 +47,10 @@ def create_simple_icon():
     
     painter.end()
     
-    return QIcon(pixmap)
+    pixmap = QPixmap.fromImage(image)
+    QPixmapCache.insert('app_icon', pixmap)
+    _ICON_CACHE = QIcon(pixmap)
+    return _ICON_CACHE
 
 def main():
     """
@@ -62,6 +72,11 @@ def main():
     # Set application style
     app.setStyle('Fusion')
     
+    # Imported here rather than at module level so the heavy widget and
+    # database modules load after the QApplication is already up
+    from database import DatabaseManager
+    from ui_mainwindow import MainWindow
+
     # Initialize database
     db_manager = DatabaseManager()
     db_manager.initialize_database()
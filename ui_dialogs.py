@@ -7,6 +7,7 @@ Contains dialog windows with modern dark theme styling.
 """
 
 import os
+import stat
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QFileDialog, QSpinBox, QCheckBox, QGroupBox,
@@ -16,6 +17,41 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
 from database import DatabaseManager
 
+#: Resolved once; the home directory cannot change within the process
+HOME_DIR = os.path.expanduser('~')
+
+#: Byte values behind the chunk-size combo, in combo-index order; the
+#: reverse map turns a stored value back into an index on load
+CHUNK_SIZES = (65536, 262144, 1048576, 4194304, 8388608)
+CHUNK_INDEX = {size: index for index, size in enumerate(CHUNK_SIZES)}
+
+#: Shared dialog title font, built lazily so the font-database lookup
+#: happens once (and only after the QApplication exists)
+_TITLE_FONT = None
+
+
+def _title_font() -> QFont:
+    """
+    Return the shared title font, constructing it on first use.
+    """
+    global _TITLE_FONT
+    if _TITLE_FONT is None:
+        _TITLE_FONT = QFont("Segoe UI", 18, QFont.Bold)
+    return _TITLE_FONT
+
+
+def _is_dir(path: str) -> bool:
+    """
+    True if path names an existing directory.
+
+    One stat() call, and unlike os.path.exists it rejects plain files,
+    which would otherwise slip through folder validation.
+    """
+    try:
+        return stat.S_ISDIR(os.stat(path).st_mode)
+    except OSError:
+        return False
+
 
 class AddDownloadDialog(QDialog):
     """
@@ -32,6 +68,11 @@ class AddDownloadDialog(QDialog):
         """
         super().__init__(parent)
         self.db_manager = db_manager
+
+        # Built once and reused by every validation failure, so repeat
+        # warnings skip the message box construction and style matching
+        self._error_box = QMessageBox(QMessageBox.Warning, "Error", "", QMessageBox.Ok, self)
+
         self.setup_ui()
     
     def setup_ui(self):
@@ -39,6 +80,7 @@ class AddDownloadDialog(QDialog):
         Setup the user interface.
         """
         self.setWindowTitle("Add New Download")
+        self.setObjectName("addDownloadDialog")
         self.setModal(True)
         self.setMinimumWidth(550)
         self.setMinimumHeight(250)
@@ -50,8 +92,7 @@ class AddDownloadDialog(QDialog):
         # Title
         title = QLabel("Add New Download")
         title.setObjectName("dialogTitle")
-        title_font = QFont("Segoe UI", 18, QFont.Bold)
-        title.setFont(title_font)
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # URL input
@@ -120,87 +161,6 @@ class AddDownloadDialog(QDialog):
         button_layout.addWidget(cancel_btn)
         button_layout.addWidget(ok_btn)
         layout.addLayout(button_layout)
-        
-        # Apply modern theme
-        self.apply_modern_theme()
-    
-    def apply_modern_theme(self):
-        """
-        Apply modern dark theme.
-        """
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e2e;
-            }
-            
-            #dialogTitle {
-                color: #e0e0e0;
-                margin-bottom: 10px;
-            }
-            
-            #fieldLabel {
-                color: #b0b0b0;
-                font-size: 13px;
-                font-weight: 600;
-            }
-            
-            #modernInput {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                padding: 10px 14px;
-                color: #e0e0e0;
-                font-size: 14px;
-            }
-            
-            #modernInput:focus {
-                border: 2px solid #4a90e2;
-            }
-            
-            #browseButton {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                color: #e0e0e0;
-                font-size: 13px;
-                font-weight: 600;
-            }
-            
-            #browseButton:hover {
-                background-color: #3a3a4e;
-                border-color: #4a90e2;
-            }
-            
-            #primaryButton {
-                background-color: #4a90e2;
-                border: none;
-                border-radius: 6px;
-                color: #ffffff;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            
-            #primaryButton:hover {
-                background-color: #5aa0f2;
-            }
-            
-            #primaryButton:pressed {
-                background-color: #3a80d2;
-            }
-            
-            #cancelButton {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                color: #e0e0e0;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            
-            #cancelButton:hover {
-                background-color: #3a3a4e;
-            }
-        """)
     
     def browse_folder(self):
         """
@@ -209,12 +169,19 @@ class AddDownloadDialog(QDialog):
         folder = QFileDialog.getExistingDirectory(
             self,
             "Select Download Folder",
-            self.save_input.text() or os.path.expanduser('~')
+            self.save_input.text() or HOME_DIR
         )
         
         if folder:
             self.save_input.setText(folder)
     
+    def _warn(self, message):
+        """
+        Show a validation warning in the cached message box.
+        """
+        self._error_box.setText(message)
+        self._error_box.exec_()
+    
     def accept_download(self):
         """
         Validate and accept download.
@@ -223,15 +190,15 @@ class AddDownloadDialog(QDialog):
         save_path = self.save_input.text().strip()
         
         if not url:
-            QMessageBox.warning(self, "Error", "Please enter a URL.")
+            self._warn("Please enter a URL.")
             return
         
         if not save_path:
-            QMessageBox.warning(self, "Error", "Please select a save location.")
+            self._warn("Please select a save location.")
             return
         
-        if not os.path.exists(save_path):
-            QMessageBox.warning(self, "Error", "Selected folder does not exist.")
+        if not _is_dir(save_path):
+            self._warn("Selected folder does not exist.")
             return
         
         self.accept()
@@ -261,6 +228,7 @@ class SettingsDialog(QDialog):
         """
         super().__init__(parent)
         self.db_manager = db_manager
+        self._error_box = QMessageBox(QMessageBox.Warning, "Error", "", QMessageBox.Ok, self)
         self.setup_ui()
         self.load_settings()
     
@@ -269,6 +237,7 @@ class SettingsDialog(QDialog):
         Setup the user interface.
         """
         self.setWindowTitle("Settings")
+        self.setObjectName("settingsDialog")
         self.setModal(True)
         self.setMinimumWidth(600)
         self.setMinimumHeight(550)
@@ -280,8 +249,7 @@ class SettingsDialog(QDialog):
         # Title
         title = QLabel("Settings")
         title.setObjectName("dialogTitle")
-        title_font = QFont("Segoe UI", 18, QFont.Bold)
-        title.setFont(title_font)
+        title.setFont(_title_font())
         layout.addWidget(title)
         
         # Download Settings Group
@@ -335,8 +303,8 @@ class SettingsDialog(QDialog):
         # Chunk size
         self.chunk_size_combo = QComboBox()
         self.chunk_size_combo.setObjectName("modernComboBox")
-        self.chunk_size_combo.addItems(["4 KB", "8 KB (Default)", "16 KB", "32 KB", "64 KB"])
-        self.chunk_size_combo.setCurrentIndex(1)  # 8 KB default
+        self.chunk_size_combo.addItems(["64 KB", "256 KB", "1 MB (Default)", "4 MB", "8 MB"])
+        self.chunk_size_combo.setCurrentIndex(2)  # 1 MB default
         self.chunk_size_combo.setMinimumHeight(40)
         download_layout.addRow("Download Chunk Size:", self.chunk_size_combo)
         
@@ -379,166 +347,6 @@ class SettingsDialog(QDialog):
         button_layout.addWidget(cancel_btn)
         button_layout.addWidget(save_btn)
         layout.addLayout(button_layout)
-        
-        # Apply modern theme
-        self.apply_modern_theme()
-    
-    def apply_modern_theme(self):
-        """
-        Apply modern dark theme.
-        """
-        self.setStyleSheet("""
-            QDialog {
-                background-color: #1e1e2e;
-            }
-            
-            #dialogTitle {
-                color: #e0e0e0;
-                margin-bottom: 10px;
-            }
-            
-            #modernGroup {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                border-radius: 8px;
-                font-weight: 600;
-                color: #e0e0e0;
-                margin-top: 10px;
-                padding-top: 10px;
-            }
-            
-            #modernGroup::title {
-                subcontrol-origin: margin;
-                left: 15px;
-                padding: 0 8px;
-                color: #4a90e2;
-            }
-            
-            QLabel {
-                color: #b0b0b0;
-                font-size: 13px;
-            }
-            
-            #modernInput {
-                background-color: #1e1e2e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                padding: 10px 14px;
-                color: #e0e0e0;
-                font-size: 13px;
-            }
-            
-            #modernInput:focus {
-                border: 2px solid #4a90e2;
-            }
-            
-            #modernSpinBox {
-                background-color: #1e1e2e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                padding: 10px 14px;
-                color: #e0e0e0;
-                font-size: 13px;
-            }
-            
-            #modernSpinBox:focus {
-                border: 2px solid #4a90e2;
-            }
-            
-            #modernSpinBox::up-button, #modernSpinBox::down-button {
-                background-color: #3a3a4e;
-                border: none;
-                width: 20px;
-            }
-            
-            #modernSpinBox::up-button:hover, #modernSpinBox::down-button:hover {
-                background-color: #4a90e2;
-            }
-            
-            #modernComboBox {
-                background-color: #1e1e2e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                padding: 10px 14px;
-                color: #e0e0e0;
-                font-size: 13px;
-            }
-            
-            #modernComboBox:focus {
-                border: 2px solid #4a90e2;
-            }
-            
-            #modernComboBox::drop-down {
-                border: none;
-                width: 30px;
-            }
-            
-            #modernComboBox QAbstractItemView {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                selection-background-color: #4a90e2;
-                color: #e0e0e0;
-            }
-            
-            #modernCheckBox {
-                color: #e0e0e0;
-                font-size: 13px;
-                spacing: 8px;
-            }
-            
-            #modernCheckBox::indicator {
-                width: 20px;
-                height: 20px;
-                border: 2px solid #3a3a4e;
-                border-radius: 4px;
-                background-color: #1e1e2e;
-            }
-            
-            #modernCheckBox::indicator:checked {
-                background-color: #4a90e2;
-                border-color: #4a90e2;
-            }
-            
-            #browseButton {
-                background-color: #1e1e2e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                color: #e0e0e0;
-                font-size: 13px;
-                font-weight: 600;
-            }
-            
-            #browseButton:hover {
-                background-color: #2a2a3e;
-                border-color: #4a90e2;
-            }
-            
-            #primaryButton {
-                background-color: #4a90e2;
-                border: none;
-                border-radius: 6px;
-                color: #ffffff;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            
-            #primaryButton:hover {
-                background-color: #5aa0f2;
-            }
-            
-            #cancelButton {
-                background-color: #2a2a3e;
-                border: 2px solid #3a3a4e;
-                border-radius: 6px;
-                color: #e0e0e0;
-                font-size: 14px;
-                font-weight: 600;
-            }
-            
-            #cancelButton:hover {
-                background-color: #3a3a4e;
-            }
-        """)
     
     def browse_folder(self):
         """
@@ -547,7 +355,7 @@ class SettingsDialog(QDialog):
         folder = QFileDialog.getExistingDirectory(
             self,
             "Select Default Download Folder",
-            self.folder_input.text() or os.path.expanduser('~')
+            self.folder_input.text() or HOME_DIR
         )
         
         if folder:
@@ -575,37 +383,44 @@ class SettingsDialog(QDialog):
             self.folder_input.setText(default_folder)
         
         # Chunk size
-        chunk_size = int(self.db_manager.get_setting('chunk_size') or '8192')
-        chunk_index = {4096: 0, 8192: 1, 16384: 2, 32768: 3, 65536: 4}.get(chunk_size, 1)
+        chunk_size = int(self.db_manager.get_setting('chunk_size') or str(1 << 20))
+        chunk_index = CHUNK_INDEX.get(chunk_size, 2)
         self.chunk_size_combo.setCurrentIndex(chunk_index)
         
         # Notifications
         enable_notifications = self.db_manager.get_setting('enable_notifications') == 'true'
         self.enable_notifications_check.setChecked(enable_notifications)
     
+    def _warn(self, message):
+        """
+        Show a validation warning in the cached message box.
+        """
+        self._error_box.setText(message)
+        self._error_box.exec_()
+    
     def save_settings(self):
         """
         Save settings to database.
         """
         # Validate folder
         folder = self.folder_input.text().strip()
-        if not os.path.exists(folder):
-            QMessageBox.warning(self, "Error", "Selected folder does not exist.")
+        if not _is_dir(folder):
+            self._warn("Selected folder does not exist.")
             return
         
-        # Save settings
-        self.db_manager.set_setting('max_concurrent_downloads', str(self.max_concurrent_spin.value()))
-        self.db_manager.set_setting('num_connections', str(self.num_connections_spin.value()))
-        self.db_manager.set_setting('force_single_https', 'true' if self.force_single_https_check.isChecked() else 'false')
-        self.db_manager.set_setting('default_download_folder', folder)
-        
         # Chunk size
-        chunk_sizes = [4096, 8192, 16384, 32768, 65536]
-        chunk_size = chunk_sizes[self.chunk_size_combo.currentIndex()]
-        self.db_manager.set_setting('chunk_size', str(chunk_size))
+        chunk_size = CHUNK_SIZES[self.chunk_size_combo.currentIndex()]
         
         # Notifications
         enable_notifications = 'true' if self.enable_notifications_check.isChecked() else 'false'
-        self.db_manager.set_setting('enable_notifications', enable_notifications)
+        
+        # One transaction for all six writes, so saving costs one commit
+        with self.db_manager.transaction():
+            self.db_manager.set_setting('max_concurrent_downloads', str(self.max_concurrent_spin.value()))
+            self.db_manager.set_setting('num_connections', str(self.num_connections_spin.value()))
+            self.db_manager.set_setting('force_single_https', 'true' if self.force_single_https_check.isChecked() else 'false')
+            self.db_manager.set_setting('default_download_folder', folder)
+            self.db_manager.set_setting('chunk_size', str(chunk_size))
+            self.db_manager.set_setting('enable_notifications', enable_notifications)
         
         self.accept()
\ No newline at end of file
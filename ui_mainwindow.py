@@ -19,7 +19,6 @@ import requests
 
 from database import DatabaseManager
 from download_manager import DownloadManager
-from ui_dialogs import AddDownloadDialog, SettingsDialog
 from utils import format_bytes, format_speed, get_filename_from_url, calculate_eta
 
 
@@ -430,10 +429,196 @@ class MainWindow(QMainWindow):
                 background-color: #3a3a4e;
                 margin: 4px 6px;
             }
+            
+            /* Dialogs — parented to this window, so they inherit this
+               sheet; parsed once here instead of per dialog open */
+            #addDownloadDialog, #settingsDialog {
+                background-color: #1e1e2e;
+            }
+            
+            #dialogTitle {
+                color: #e0e0e0;
+                margin-bottom: 10px;
+            }
+            
+            #fieldLabel {
+                color: #b0b0b0;
+                font-size: 13px;
+                font-weight: 600;
+            }
+            
+            #settingsDialog QLabel {
+                color: #b0b0b0;
+                font-size: 13px;
+            }
+            
+            #modernInput {
+                border: 2px solid #3a3a4e;
+                border-radius: 6px;
+                padding: 10px 14px;
+                color: #e0e0e0;
+            }
+            
+            #addDownloadDialog #modernInput {
+                background-color: #2a2a3e;
+                font-size: 14px;
+            }
+            
+            #settingsDialog #modernInput {
+                background-color: #1e1e2e;
+                font-size: 13px;
+            }
+            
+            #modernInput:focus {
+                border: 2px solid #4a90e2;
+            }
+            
+            #browseButton {
+                border: 2px solid #3a3a4e;
+                border-radius: 6px;
+                color: #e0e0e0;
+                font-size: 13px;
+                font-weight: 600;
+            }
+            
+            #addDownloadDialog #browseButton {
+                background-color: #2a2a3e;
+            }
+            
+            #addDownloadDialog #browseButton:hover {
+                background-color: #3a3a4e;
+                border-color: #4a90e2;
+            }
+            
+            #settingsDialog #browseButton {
+                background-color: #1e1e2e;
+            }
+            
+            #settingsDialog #browseButton:hover {
+                background-color: #2a2a3e;
+                border-color: #4a90e2;
+            }
+            
+            #primaryButton {
+                background-color: #4a90e2;
+                border: none;
+                border-radius: 6px;
+                color: #ffffff;
+                font-size: 14px;
+                font-weight: 600;
+            }
+            
+            #primaryButton:hover {
+                background-color: #5aa0f2;
+            }
+            
+            #primaryButton:pressed {
+                background-color: #3a80d2;
+            }
+            
+            #cancelButton {
+                background-color: #2a2a3e;
+                border: 2px solid #3a3a4e;
+                border-radius: 6px;
+                color: #e0e0e0;
+                font-size: 14px;
+                font-weight: 600;
+            }
+            
+            #cancelButton:hover {
+                background-color: #3a3a4e;
+            }
+            
+            #modernGroup {
+                background-color: #2a2a3e;
+                border: 2px solid #3a3a4e;
+                border-radius: 8px;
+                font-weight: 600;
+                color: #e0e0e0;
+                margin-top: 10px;
+                padding-top: 10px;
+            }
+            
+            #modernGroup::title {
+                subcontrol-origin: margin;
+                left: 15px;
+                padding: 0 8px;
+                color: #4a90e2;
+            }
+            
+            #modernSpinBox {
+                background-color: #1e1e2e;
+                border: 2px solid #3a3a4e;
+                border-radius: 6px;
+                padding: 10px 14px;
+                color: #e0e0e0;
+                font-size: 13px;
+            }
+            
+            #modernSpinBox:focus {
+                border: 2px solid #4a90e2;
+            }
+            
+            #modernSpinBox::up-button, #modernSpinBox::down-button {
+                background-color: #3a3a4e;
+                border: none;
+                width: 20px;
+            }
+            
+            #modernSpinBox::up-button:hover, #modernSpinBox::down-button:hover {
+                background-color: #4a90e2;
+            }
+            
+            #modernComboBox {
+                background-color: #1e1e2e;
+                border: 2px solid #3a3a4e;
+                border-radius: 6px;
+                padding: 10px 14px;
+                color: #e0e0e0;
+                font-size: 13px;
+            }
+            
+            #modernComboBox:focus {
+                border: 2px solid #4a90e2;
+            }
+            
+            #modernComboBox::drop-down {
+                border: none;
+                width: 30px;
+            }
+            
+            #modernComboBox QAbstractItemView {
+                background-color: #2a2a3e;
+                border: 2px solid #3a3a4e;
+                selection-background-color: #4a90e2;
+                color: #e0e0e0;
+            }
+            
+            #modernCheckBox {
+                color: #e0e0e0;
+                font-size: 13px;
+                spacing: 8px;
+            }
+            
+            #modernCheckBox::indicator {
+                width: 20px;
+                height: 20px;
+                border: 2px solid #3a3a4e;
+                border-radius: 4px;
+                background-color: #1e1e2e;
+            }
+            
+            #modernCheckBox::indicator:checked {
+                background-color: #4a90e2;
+                border-color: #4a90e2;
+            }
         """)
     
     def show_add_download_dialog(self):
         """Show add download dialog."""
+        # Imported on first use: the dialog module is only needed once the
+        # user clicks Add/Settings, so it stays off the startup path
+        from ui_dialogs import AddDownloadDialog
         dialog = AddDownloadDialog(self, self.db_manager)
         if dialog.exec_():
             url, save_path = dialog.get_data()
@@ -441,6 +626,7 @@ class MainWindow(QMainWindow):
     
     def show_settings_dialog(self):
         """Show settings dialog."""
+        from ui_dialogs import SettingsDialog
         dialog = SettingsDialog(self, self.db_manager)
         if dialog.exec_():
             max_concurrent = int(self.db_manager.get_setting('max_concurrent_downloads') or '3')
@@ -475,12 +661,12 @@ class MainWindow(QMainWindow):
             download_id = self.db_manager.add_download(url, filename, filepath, filesize)
             
             # Add to download manager with optimized settings
-            chunk_size = int(self.db_manager.get_setting('chunk_size') or '8192')
+            chunk_size = int(self.db_manager.get_setting('chunk_size') or str(1 << 20))
             num_connections = int(self.db_manager.get_setting('num_connections') or '8')
             task = self.download_manager.add_download(download_id, url, filepath, chunk_size, num_connections)
             
-            # Connect signals
-            task.progress_updated.connect(self.on_progress_updated)
+            # Connect signals (progress is pulled by update_table instead
+            # of pushed per task)
             task.status_changed.connect(self.on_status_changed)
             task.download_completed.connect(self.on_download_completed)
             task.download_failed.connect(self.on_download_failed)
@@ -578,11 +764,10 @@ class MainWindow(QMainWindow):
             if status in ['downloading', 'paused', 'pending']:
                 url = download['url']
                 filepath = download['filepath']
-                chunk_size = int(self.db_manager.get_setting('chunk_size') or '8192')
+                chunk_size = int(self.db_manager.get_setting('chunk_size') or str(1 << 20))
                 num_connections = int(self.db_manager.get_setting('num_connections') or '8')
                 
                 task = self.download_manager.add_download(download_id, url, filepath, chunk_size, num_connections)
-                task.progress_updated.connect(self.on_progress_updated)
                 task.status_changed.connect(self.on_status_changed)
                 task.download_completed.connect(self.on_download_completed)
                 task.download_failed.connect(self.on_download_failed)
@@ -605,7 +790,7 @@ class MainWindow(QMainWindow):
             download_id = int(download_id_item.text())
             task = self.download_manager.get_download(download_id)
             
-            if task and task.thread and task.thread.is_alive() and not task.is_paused:
+            if task and task.is_active() and not task.is_paused:
                 active_count += 1
                 
                 # Update progress
@@ -614,18 +799,23 @@ class MainWindow(QMainWindow):
                     progress = int((task.downloaded_bytes / task.total_bytes) * 100)
                     progress_bar.setValue(progress)
                 
-                # Update database
-                download_data = self.db_manager.get_download(download_id)
-                if download_data:
-                    speed = download_data['speed']
-                    total_speed += speed
-                    
-                    # Calculate and display time left
-                    if speed > 0 and task.total_bytes > 0:
-                        eta = calculate_eta(task.downloaded_bytes, task.total_bytes, speed)
-                        time_item = self.downloads_table.item(row, 4)
-                        if time_item:
-                            time_item.setText(eta)
+                # Pull speed straight from the task (no per-row SELECT)
+                # and persist progress through the coalescing writer
+                speed = task.speed
+                total_speed += speed
+                self.db_manager.update_download_progress(
+                    download_id, task.downloaded_bytes, speed)
+                
+                speed_item = self.downloads_table.item(row, 3)
+                if speed_item:
+                    speed_item.setText(format_speed(speed))
+                
+                # Calculate and display time left
+                if speed > 0 and task.total_bytes > 0:
+                    eta = calculate_eta(task.downloaded_bytes, task.total_bytes, speed)
+                    time_item = self.downloads_table.item(row, 4)
+                    if time_item:
+                        time_item.setText(eta)
             else:
                 # Clear time left for non-active downloads
                 time_item = self.downloads_table.item(row, 4)
@@ -636,19 +826,6 @@ class MainWindow(QMainWindow):
         self.speed_label.setText(f"Speed: {format_speed(total_speed)}")
         self.active_label.setText(f"Active: {active_count}")
     
-    @pyqtSlot(int, int, float)
-    def on_progress_updated(self, download_id: int, downloaded: int, speed: float):
-        """Handle progress update signal."""
-        self.db_manager.update_download_progress(download_id, downloaded, speed)
-        
-        for row in range(self.downloads_table.rowCount()):
-            id_item = self.downloads_table.item(row, 7)
-            if id_item and int(id_item.text()) == download_id:
-                speed_item = self.downloads_table.item(row, 3)
-                if speed_item:
-                    speed_item.setText(format_speed(speed))
-                break
-    
     @pyqtSlot(int, str)
     def on_status_changed(self, download_id: int, status: str):
         """Handle status change signal."""
@@ -832,7 +1009,7 @@ class MainWindow(QMainWindow):
         """Handle window close event."""
         active_count = sum(
             1 for task in self.download_manager.active_downloads.values()
-            if task.thread and task.thread.is_alive() and not task.is_paused
+            if task.is_active() and not task.is_paused
         )
         
         if active_count > 0:
@@ -846,5 +1023,6 @@ class MainWindow(QMainWindow):
                 event.ignore()
                 return
         
+        self.download_manager.shutdown()
         self.db_manager.close()
         event.accept()
\ No newline at end of file